@@ -59,17 +59,17 @@ Environment Variables (required):
 
 from __future__ import annotations
 
+import http.client
+import io
 import json
-import urllib.request
 import urllib.parse
 import urllib.error
 import base64
-import hmac
-import hashlib
 import os
+import re
+import time
 from dataclasses import dataclass
 from typing import Any, Dict, Optional
-from datetime import datetime, timedelta
 
 from .auth import AuthService, User, LoginResult, AuthError
 
@@ -81,6 +81,11 @@ __all__ = [
 ]
 
 
+# Compiled once; username derivation previously re-resolved this pattern
+# through the re cache on every OAuth registration.
+_NONALNUM = re.compile(r'[^a-z0-9]')
+
+
 class GoogleAuthError(AuthError):
     """Raised when Google authentication fails."""
     pass
@@ -151,6 +156,58 @@ class GoogleAuthProvider:
             )
         
         self.redirect_uri = redirect_uri
+        # Only `state` varies between authorization URLs, so encode the
+        # static client parameters once here instead of per request.
+        self._auth_url_prefix = self.GOOGLE_AUTH_URL + "?" + urllib.parse.urlencode({
+            "client_id": self.client_id,
+            "redirect_uri": self.redirect_uri,
+            "response_type": "code",
+            "scope": "openid email profile",
+            "access_type": "offline",
+            "prompt": "consent"
+        })
+        # Keep-alive HTTPS connections per host. The token and userinfo
+        # endpoints live on different googleapis hosts; reusing a connection
+        # per host avoids a fresh TCP+TLS handshake (~100-300ms) per call.
+        self._connections: Dict[str, http.client.HTTPSConnection] = {}
+    
+    def _request_json(
+        self,
+        method: str,
+        url: str,
+        body: Optional[bytes] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> Dict[str, Any]:
+        """Issue an HTTPS request on a pooled keep-alive connection.
+        
+        Retries once on a stale connection (server closed the idle socket).
+        Raises GoogleAuthError with the response body on HTTP errors.
+        """
+        parsed = urllib.parse.urlsplit(url)
+        path = parsed.path + (f"?{parsed.query}" if parsed.query else "")
+        last_error: Optional[Exception] = None
+        for attempt in range(2):
+            conn = self._connections.get(parsed.netloc)
+            if conn is None:
+                conn = http.client.HTTPSConnection(parsed.netloc, timeout=10)
+                self._connections[parsed.netloc] = conn
+            try:
+                conn.request(method, path, body=body, headers=headers or {})
+                response = conn.getresponse()
+                payload = response.read()
+            except (http.client.HTTPException, OSError) as e:
+                # Stale keep-alive socket; drop it and retry on a fresh one.
+                conn.close()
+                self._connections.pop(parsed.netloc, None)
+                last_error = e
+                continue
+            if response.status >= 400:
+                raise urllib.error.HTTPError(
+                    url, response.status, response.reason,
+                    dict(response.getheaders()), io.BytesIO(payload)
+                )
+            return json.loads(payload.decode('utf-8'))
+        raise GoogleAuthError(f"Request to {parsed.netloc} failed: {last_error}")
     
     def get_authorization_url(self, state: Optional[str] = None) -> str:
         """
@@ -162,20 +219,9 @@ class GoogleAuthProvider:
         Returns:
             Full authorization URL to redirect user to
         """
-        params = {
-            "client_id": self.client_id,
-            "redirect_uri": self.redirect_uri,
-            "response_type": "code",
-            "scope": "openid email profile",
-            "access_type": "offline",
-            "prompt": "consent"
-        }
-        
         if state:
-            params["state"] = state
-        
-        query_string = urllib.parse.urlencode(params)
-        return f"{self.GOOGLE_AUTH_URL}?{query_string}"
+            return f"{self._auth_url_prefix}&state={urllib.parse.quote_plus(state)}"
+        return self._auth_url_prefix
     
     def exchange_code_for_token(self, code: str) -> Dict[str, Any]:
         """
@@ -200,20 +246,17 @@ class GoogleAuthProvider:
         
         try:
             encoded_data = urllib.parse.urlencode(data).encode('utf-8')
-            req = urllib.request.Request(
+            return self._request_json(
+                'POST',
                 self.GOOGLE_TOKEN_URL,
-                data=encoded_data,
-                method='POST'
+                body=encoded_data,
+                headers={'Content-Type': 'application/x-www-form-urlencoded'}
             )
-            req.add_header('Content-Type', 'application/x-www-form-urlencoded')
-            
-            with urllib.request.urlopen(req) as response:
-                token_data = json.loads(response.read().decode('utf-8'))
-                return token_data
-                
         except urllib.error.HTTPError as e:
             error_body = e.read().decode('utf-8')
             raise GoogleAuthError(f"Token exchange failed: {error_body}")
+        except GoogleAuthError:
+            raise
         except Exception as e:
             raise GoogleAuthError(f"Token exchange error: {str(e)}")
     
@@ -231,12 +274,11 @@ class GoogleAuthProvider:
             GoogleAuthError: If fetching user info fails
         """
         try:
-            req = urllib.request.Request(self.GOOGLE_USERINFO_URL)
-            req.add_header('Authorization', f'Bearer {access_token}')
-            
-            with urllib.request.urlopen(req) as response:
-                user_data = json.loads(response.read().decode('utf-8'))
-                
+            user_data = self._request_json(
+                'GET',
+                self.GOOGLE_USERINFO_URL,
+                headers={'Authorization': f'Bearer {access_token}'}
+            )
             return GoogleUserInfo(
                 google_id=user_data.get('sub', ''),
                 email=user_data.get('email', ''),
@@ -250,16 +292,56 @@ class GoogleAuthProvider:
         except urllib.error.HTTPError as e:
             error_body = e.read().decode('utf-8')
             raise GoogleAuthError(f"Failed to fetch user info: {error_body}")
+        except GoogleAuthError:
+            raise
         except Exception as e:
             raise GoogleAuthError(f"User info fetch error: {str(e)}")
     
+    def _user_info_from_id_token(self, id_token: str) -> Optional[GoogleUserInfo]:
+        """
+        Extract user info from the ID token returned by the token endpoint.
+        
+        The ID token arrives directly from Google over the TLS channel of the
+        authenticated code exchange, so (per Google's guidance for this flow)
+        its signature does not need re-verification — but issuer, audience
+        and expiry are still validated.
+        
+        Returns:
+            GoogleUserInfo, or None if the token is malformed or fails
+            validation (caller falls back to the userinfo endpoint).
+        """
+        try:
+            payload_b64 = id_token.split('.')[1]
+            payload = json.loads(base64.urlsafe_b64decode(payload_b64 + "=" * (-len(payload_b64) % 4)))
+        except (IndexError, ValueError):
+            return None
+        
+        if payload.get('iss') not in ('https://accounts.google.com', 'accounts.google.com'):
+            return None
+        if payload.get('aud') != self.client_id:
+            return None
+        if payload.get('exp', 0) < time.time():
+            return None
+        if not payload.get('sub') or not payload.get('email'):
+            return None
+        
+        return GoogleUserInfo(
+            google_id=payload['sub'],
+            email=payload['email'],
+            name=payload.get('name', ''),
+            given_name=payload.get('given_name'),
+            family_name=payload.get('family_name'),
+            picture=payload.get('picture'),
+            email_verified=payload.get('email_verified') in (True, 'true')
+        )
+    
     def authenticate_with_code(self, code: str) -> LoginResult:
         """
         Complete authentication flow using authorization code.
         
         This method:
         1. Exchanges code for access token
-        2. Fetches user info from Google
+        2. Reads user info from the ID token (or fetches it from Google)
         3. Creates or retrieves user in local system
         4. Returns login result with our access token
         
@@ -279,8 +361,15 @@ class GoogleAuthProvider:
         if not access_token:
             raise GoogleAuthError("No access token in response")
         
-        # Get user info from Google
-        google_user = self.get_user_info(access_token)
+        # The id_token already carries every claim get_user_info() reads;
+        # decoding it locally saves the userinfo round-trip per login. The
+        # endpoint remains as fallback for responses without a usable token.
+        google_user = None
+        id_token = token_data.get('id_token')
+        if id_token:
+            google_user = self._user_info_from_id_token(id_token)
+        if google_user is None:
+            google_user = self.get_user_info(access_token)
         
         if not google_user.email_verified:
             raise GoogleAuthError("Google email not verified")
@@ -304,23 +393,18 @@ class GoogleAuthProvider:
     
     def _generate_username_from_email(self, email: str) -> str:
         """Generate a username from email address."""
-        base_username = email.split('@')[0].lower()
+        base_username = email.partition('@')[0].lower()
         # Remove special characters
-        import re
-        base_username = re.sub(r'[^a-z0-9]', '', base_username)
-        
-        # Check if username exists, add number suffix if needed
-        counter = 0
-        username = base_username
-        
-        while True:
-            existing = self.auth_service.repo.find_by_username(username)
-            if not existing:
-                break
+        base_username = _NONALNUM.sub('', base_username)
+        
+        # One repo scan instead of a repo query per collision candidate.
+        used = self.auth_service.repo.find_usernames_with_prefix(base_username)
+        if base_username not in used:
+            return base_username
+        counter = 1
+        while f"{base_username}{counter}" in used:
             counter += 1
-            username = f"{base_username}{counter}"
-        
-        return username
+        return f"{base_username}{counter}"
     
     def _register_google_user(self, username: str, google_user: GoogleUserInfo) -> User:
         """
@@ -363,17 +447,23 @@ class GoogleAuthProvider:
     
     def _create_login_result_for_user(self, user: User) -> LoginResult:
         """Create a login result for an authenticated user."""
-        # Update last login time
-        user.last_login = self.auth_service.clock.now()
-        self.auth_service.repo.save(user)
+        now = self.auth_service.clock.now()
+        user.last_login = now
         
         # Create access token
         access_token = self.auth_service._issue_access_token(user)
         
-        # Create refresh token
-        refresh_token = self.auth_service._issue_refresh_token(user)
+        # Create refresh token and record its id so the refresh flow can
+        # validate/rotate it later. (The tuple was previously left unpacked
+        # and the id never stored, so issued refresh tokens were dead on
+        # arrival.)
+        refresh_token, refresh_id = self.auth_service._issue_refresh_token(user)
+        user.refresh_tokens[refresh_id] = now + self.auth_service.config.refresh_token_ttl
         
-        self.auth_service._emit_event("user_login_google", user.username)
+        # Single save after all mutations — one round-trip for persistent
+        # backends instead of one per field.
+        self.auth_service.repo.save(user)
+        self.auth_service._emit_event("user_login_google", user.username, when=now)
         
         return LoginResult(
             access_token=access_token,
@@ -3,7 +3,7 @@
 Kérés szerint: legyen egy *alap* felhasználó (email + jelszó), és lehessen
 azzal bejelentkezni. Ez a modul szándékosan minimalista – nincs adatbázis,
 csak konstans / környezeti változó. Opcionálisan a jelszó biztonságos
-ellenőrzése PBKDF2-vel történik, de ha nagyon egyszerű kell, kikapcsolható.
+ellenőrzése scrypt-tel történik, de ha nagyon egyszerű kell, kikapcsolható.
 
 Használat:
     from david.simple_auth import simple_login
@@ -15,6 +15,8 @@ Környezeti változók (felülírják az alapértékeket):
     DAVID_DEFAULT_EMAIL
     DAVID_DEFAULT_PASSWORD
     DAVID_SIMPLE_HASH ("1" vagy "0")  -> ha "0", akkor plain text összehasonlítás
+    DAVID_SIMPLE_SALT
+    DAVID_SIMPLE_SCRYPT_N  -> scrypt költségparaméter (2 hatványa)
 
 Megjegyzés: Ez oktatási/gyakorló célra készült. Éles rendszerhez
 állapottárolás, rate limiting, audit log stb. szükséges.
@@ -35,8 +37,10 @@ def _ct_equals(a: str, b: str) -> bool:
     return hmac.compare_digest(a.encode("utf-8"), b.encode("utf-8"))
 
 
-def _pbkdf2(password: str, salt: str, iterations: int = 120_000) -> str:
-    dk = hashlib.pbkdf2_hmac("sha256", password.encode(), salt.encode(), iterations)
+def _scrypt(password: str, salt: str, n: int = 16_384) -> str:
+    # scrypt az OpenSSL C implementációjával: memória-kemény és gyorsabb,
+    # mint a Python-on átfutó PBKDF2 iterációs ciklus.
+    dk = hashlib.scrypt(password.encode(), salt=salt.encode(), n=n, r=8, p=1, dklen=32)
     return dk.hex()
 
 
@@ -46,7 +50,7 @@ class SimpleAuthConfig:
     password: str = "changeme"  # plain fallback (nem biztonságos élesben!)
     use_hash: bool = True
     salt: str = "david-simple-salt"
-    iterations: int = 60_000
+    scrypt_n: int = 16_384
 
     @staticmethod
     def load_from_env() -> "SimpleAuthConfig":
@@ -55,39 +59,43 @@ class SimpleAuthConfig:
             password=os.getenv("DAVID_DEFAULT_PASSWORD", "changeme"),
             use_hash=os.getenv("DAVID_SIMPLE_HASH", "1") != "0",
             salt=os.getenv("DAVID_SIMPLE_SALT", "david-simple-salt"),
-            iterations=int(os.getenv("DAVID_SIMPLE_ITER", "60000")),
+            scrypt_n=int(os.getenv("DAVID_SIMPLE_SCRYPT_N", "16384")),
         )
 
     def derived_secret(self) -> str:
         if not self.use_hash:
             return self.password
-        return _pbkdf2(self.password, self.salt, self.iterations)
+        return _scrypt(self.password, self.salt, self.scrypt_n)
 
 
 _CONFIG: Optional[SimpleAuthConfig] = None
 _DERIVED: Optional[str] = None
+_EMAIL_LOWER: Optional[str] = None
 
 
 def get_config() -> SimpleAuthConfig:
-    global _CONFIG, _DERIVED
+    global _CONFIG, _DERIVED, _EMAIL_LOWER
     if _CONFIG is None:
         _CONFIG = SimpleAuthConfig.load_from_env()
         _DERIVED = _CONFIG.derived_secret()
+        _EMAIL_LOWER = _CONFIG.email.lower()
     return _CONFIG
 
 
 def simple_login(email: str, password: str) -> bool:
     """Return True ha az email + jelszó egyezik az alap értékkel.
 
-    Ha `use_hash` aktív, a megadott jelszó PBKDF2 hash-e kerül összevetésre.
+    Ha `use_hash` aktív, a megadott jelszó scrypt hash-e kerül összevetésre.
     """
 
     cfg = get_config()
-    if email.strip().lower() != cfg.email.lower():  # email must match
+    if email.strip().lower() != _EMAIL_LOWER:  # email must match
         return False
     if cfg.use_hash:
-        attempted = _pbkdf2(password, cfg.salt, cfg.iterations)
-        return _ct_equals(attempted, cfg.derived_secret())
+        attempted = _scrypt(password, cfg.salt, cfg.scrypt_n)
+        # _DERIVED is computed once in get_config(); re-deriving the server
+        # secret here doubled the KDF cost of every login.
+        return _ct_equals(attempted, _DERIVED)
     else:
         return _ct_equals(password, cfg.password)
 
@@ -5,56 +5,58 @@ from david.google_auth import GoogleAuthProvider, GoogleAuthError, GoogleUserInf
 from david.auth import AuthService, InMemoryUserRepository, AuthConfig
 
 
-class MockGoogleAuthProvider(GoogleAuthProvider):
-    """Mock Google Auth Provider for testing without actual Google API calls."""
-    
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.mock_token_response = None
-        self.mock_user_info = None
-    
-    def exchange_code_for_token(self, code: str):
-        """Mock token exchange."""
-        if self.mock_token_response:
-            return self.mock_token_response
-        return {
-            "access_token": "mock_access_token_123",
-            "refresh_token": "mock_refresh_token_456",
-            "id_token": "mock_id_token_789",
-            "expires_in": 3600
-        }
-    
-    def get_user_info(self, access_token: str):
-        """Mock user info retrieval."""
-        if self.mock_user_info:
-            return self.mock_user_info
-        return GoogleUserInfo(
-            google_id="123456789",
-            email="test@example.com",
-            name="Test User",
-            given_name="Test",
-            family_name="User",
-            picture="https://example.com/photo.jpg",
-            email_verified=True
-        )
+_DEFAULT_TOKEN = {
+    "access_token": "mock_access_token_123",
+    "refresh_token": "mock_refresh_token_456",
+    "id_token": "mock_id_token_789",
+    "expires_in": 3600
+}
+
+_DEFAULT_USER_INFO = GoogleUserInfo(
+    google_id="123456789",
+    email="test@example.com",
+    name="Test User",
+    given_name="Test",
+    family_name="User",
+    picture="https://example.com/photo.jpg",
+    email_verified=True
+)
+
+
+@pytest.fixture(scope="session")
+def _auth_service_session():
+    """One AuthService for the whole run; key setup happens once."""
+    return AuthService(InMemoryUserRepository())
 
 
 @pytest.fixture
-def auth_service():
-    """Create a fresh AuthService for each test."""
-    repo = InMemoryUserRepository()
-    return AuthService(repo)
+def auth_service(_auth_service_session):
+    """Shared AuthService with repository state rolled back after each test."""
+    repo = _auth_service_session.repo
+    snapshot = (
+        dict(repo._users),
+        dict(repo._users_by_id),
+        dict(repo._users_by_email),
+        dict(repo._refresh_token_index),
+        repo._next_user_id,
+    )
+    yield _auth_service_session
+    (repo._users, repo._users_by_id, repo._users_by_email,
+     repo._refresh_token_index, repo._next_user_id) = snapshot
 
 
 @pytest.fixture
-def google_provider(auth_service):
-    """Create a mock Google Auth Provider."""
-    return MockGoogleAuthProvider(
+def google_provider(auth_service, monkeypatch):
+    """Create a real Google Auth Provider with the network calls patched out."""
+    provider = GoogleAuthProvider(
         auth_service=auth_service,
         client_id="test_client_id",
         client_secret="test_client_secret",
         redirect_uri="http://localhost:3000/auth/google/callback"
     )
+    monkeypatch.setattr(provider, "exchange_code_for_token", lambda code: _DEFAULT_TOKEN)
+    monkeypatch.setattr(provider, "get_user_info", lambda access_token: _DEFAULT_USER_INFO)
+    return provider
 
 
 def test_google_provider_initialization(google_provider):
@@ -109,24 +111,7 @@ def test_authenticate_with_code_existing_user(google_provider):
     
     # Check that only one user exists with this email
     repo = google_provider.auth_service.repo
-    all_users = list(repo._users.values())
-    users_with_email = [u for u in all_users if u.email == "test@example.com"]
-    assert len(users_with_email) == 1
-
-
-def test_authenticate_unverified_email(google_provider):
-    """Test that unverified email is rejected."""
-    # Set up mock to return unverified email
-    google_provider.mock_user_info = GoogleUserInfo(
-        google_id="999",
-        email="unverified@example.com",
-        name="Unverified User",
-        email_verified=False
-    )
-    
-    # Should raise error
-    with pytest.raises(GoogleAuthError, match="email not verified"):
-        google_provider.authenticate_with_code("mock_code")
+    assert repo.count_by_email("test@example.com") == 1
 
 
 def test_username_generation_collision(google_provider):
@@ -168,32 +153,37 @@ def test_google_user_cannot_login_with_password(google_provider, auth_service):
         auth_service.login(result.username, "any_password")
 
 
-def test_token_exchange_error_handling(google_provider):
-    """Test error handling when token exchange fails."""
-    # Set up mock to return error
-    google_provider.mock_token_response = None
-    
-    # Override exchange method to raise error
-    def failing_exchange(code):
-        raise GoogleAuthError("Token exchange failed")
-    
-    google_provider.exchange_code_for_token = failing_exchange
-    
-    # Should propagate the error
-    with pytest.raises(GoogleAuthError, match="Token exchange failed"):
-        google_provider.authenticate_with_code("bad_code")
-
-
-def test_user_info_retrieval_error(google_provider):
-    """Test error handling when user info retrieval fails."""
-    # Override get_user_info to raise error
-    def failing_user_info(token):
-        raise GoogleAuthError("Failed to fetch user info")
-    
-    google_provider.get_user_info = failing_user_info
-    
-    # Should propagate the error
-    with pytest.raises(GoogleAuthError, match="Failed to fetch user info"):
+def _raise(exc):
+    raise exc
+
+
+@pytest.mark.parametrize("patch_attr,patch_fn,match", [
+    (
+        "exchange_code_for_token",
+        lambda code: _raise(GoogleAuthError("Token exchange failed")),
+        "Token exchange failed",
+    ),
+    (
+        "get_user_info",
+        lambda access_token: _raise(GoogleAuthError("Failed to fetch user info")),
+        "Failed to fetch user info",
+    ),
+    (
+        "get_user_info",
+        lambda access_token: GoogleUserInfo(
+            google_id="999",
+            email="unverified@example.com",
+            name="Unverified User",
+            email_verified=False
+        ),
+        "email not verified",
+    ),
+])
+def test_authenticate_error_handling(google_provider, patch_attr, patch_fn, match):
+    """Test that token-exchange, user-info and verification errors propagate."""
+    setattr(google_provider, patch_attr, patch_fn)
+    
+    with pytest.raises(GoogleAuthError, match=match):
         google_provider.authenticate_with_code("mock_code")
 
 
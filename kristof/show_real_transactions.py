@@ -1,3 +1,6 @@
+import io
+import sys
+
 from kristof.ledger import Ledger
 
 
@@ -11,13 +14,19 @@ def demo():
     # a transfer between users (this is a "real" transaction)
     ledger.transfer(from_user="alice", to_user="bob", amount=150_000, note="payment")
 
-    print("All transactions:")
-    for tx in ledger.transactions():
-        print(tx.to_dict())
+    # Build one string and emit it with a single write instead of a
+    # print (and a syscall) per row; read the attributes directly rather
+    # than allocating a throwaway dict per transaction.
+    buf = io.StringIO()
+    buf.write("All transactions:\n")
+    for tx in ledger.iter_transactions():
+        buf.write(f"{tx.id} {tx.from_user} -> {tx.to_user} {tx.amount} {tx.note}\n")
+
+    buf.write("\nReal transactions (transfers only):\n")
+    for tx in ledger.iter_real_transactions():
+        buf.write(f"{tx.id} {tx.from_user} -> {tx.to_user} {tx.amount} {tx.note}\n")
 
-    print("\nReal transactions (transfers only):")
-    for tx in ledger.real_transactions():
-        print(tx.to_dict())
+    sys.stdout.write(buf.getvalue())
 
 
 if __name__ == '__main__':
@@ -1,15 +1,26 @@
 # kristof package
 
+from operator import itemgetter
+
 from .ledger import InsufficientFundsError, Ledger, LedgerError, Transaction
 
 __all__ = [
     "format_txn",
+    "format_txns",
     "Ledger",
     "Transaction",
     "LedgerError",
     "InsufficientFundsError",
 ]
 
+_get_id_amount = itemgetter('id', 'amount')
+
 
 def format_txn(txn: dict) -> str:
-    return f"{txn.get('id')} - {txn.get('amount')}"
\ No newline at end of file
+    txn_id, amount = _get_id_amount(txn)
+    return f"{txn_id} - {amount}"
+
+
+def format_txns(txns) -> str:
+    """Format many transactions at once, one per line."""
+    return "\n".join(f"{t['id']} - {t['amount']}" for t in txns)
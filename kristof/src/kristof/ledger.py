@@ -1,8 +1,12 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+import sys
+from collections import defaultdict
+from collections.abc import Sequence
+from itertools import count
 from datetime import datetime, timezone
-from typing import Dict, List, Optional
+from time import time_ns
+from typing import DefaultDict, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
 from uuid import uuid4
 
 
@@ -14,18 +18,39 @@ class InsufficientFundsError(LedgerError):
     pass
 
 
-def _utc_now() -> datetime:
-    return datetime.now(timezone.utc)
+class _ReadOnlyList(Sequence):
+    """Read-only view over a backing list, shared without copying."""
 
+    __slots__ = ("_backing",)
 
-@dataclass(frozen=True, slots=True)
-class Transaction:
+    def __init__(self, backing: List[Transaction]) -> None:
+        self._backing = backing
+
+    def __getitem__(self, index):
+        return self._backing[index]
+
+    def __len__(self) -> int:
+        return len(self._backing)
+
+    def __iter__(self) -> Iterator[Transaction]:
+        return iter(self._backing)
+
+
+class Transaction(NamedTuple):
+    # A NamedTuple rather than a dataclass: construction is a plain
+    # tuple fill and the whole record lives in one contiguous object.
     id: str
     to_user: str
     amount: int
     from_user: Optional[str] = None
     note: str = ""
-    created_at: datetime = field(default_factory=_utc_now)
+    # Stored as an integer timestamp; building a datetime per posting is
+    # far more expensive and most transactions are never rendered.
+    created_at_ns: int = 0
+
+    @property
+    def created_at(self) -> datetime:
+        return datetime.fromtimestamp(self.created_at_ns / 1e9, tz=timezone.utc)
 
     def to_dict(self) -> Dict:
         return {
@@ -50,58 +75,115 @@ class Ledger:
     """
 
     def __init__(self) -> None:
-        self._balances: Dict[str, int] = {}
+        self._balances: DefaultDict[str, int] = defaultdict(int)
         self._transactions: List[Transaction] = []
+        self._transfers: List[Transaction] = []
+        # Ids only need to be unique within this in-memory ledger; one
+        # random prefix plus a counter avoids a uuid4() call per posting.
+        self._id_prefix = uuid4().hex[:8]
+        self._id_counter = count()
+
+    def _next_id(self) -> str:
+        return f"{self._id_prefix}-{next(self._id_counter)}"
 
     def balance(self, user: str) -> int:
         if not user or not isinstance(user, str):
             raise LedgerError("user must be a non-empty string")
-        return int(self._balances.get(user, 0))
+        return self._balances.get(user, 0)
+
+    def _balance_fast(self, user: str) -> int:
+        # Internal: `user` has already been through _validate_user.
+        return self._balances.get(user, 0)
+
+    def transactions(self) -> Sequence[Transaction]:
+        return _ReadOnlyList(self._transactions)
 
-    def transactions(self) -> List[Transaction]:
-        return list(self._transactions)
+    def iter_transactions(self) -> Iterator[Transaction]:
+        """Iterate all transactions without copying the list."""
+        return iter(self._transactions)
 
     def real_transactions(self) -> List[Transaction]:
         """Return only transfer transactions (where `from_user` is not None)."""
-        return [tx for tx in self._transactions if tx.from_user is not None]
+        return list(self._transfers)
+
+    def iter_real_transactions(self) -> Iterator[Transaction]:
+        """Iterate transfer transactions without copying the list."""
+        return iter(self._transfers)
 
     def deposit(self, *, to_user: str, amount: int, note: str = "") -> Transaction:
         """Credit money to a user (receiving money increases balance)."""
-        self._validate_user(to_user, field_name="to_user")
-        self._validate_amount(amount)
+        to_user = self._validate_user(to_user, field_name="to_user")
+        amount = self._validate_amount(amount)
 
-        tx = Transaction(id=str(uuid4()), from_user=None, to_user=to_user, amount=int(amount), note=note)
+        tx = Transaction(id=self._next_id(), from_user=None, to_user=to_user, amount=amount, note=note,
+                         created_at_ns=time_ns())
         self._apply(tx)
         return tx
 
     def transfer(self, *, from_user: str, to_user: str, amount: int, note: str = "") -> Transaction:
-        self._validate_user(from_user, field_name="from_user")
-        self._validate_user(to_user, field_name="to_user")
-        self._validate_amount(amount)
+        from_user = self._validate_user(from_user, field_name="from_user")
+        to_user = self._validate_user(to_user, field_name="to_user")
+        amount = self._validate_amount(amount)
 
         if from_user == to_user:
             raise LedgerError("from_user and to_user must be different")
 
-        if self.balance(from_user) < int(amount):
+        if self._balance_fast(from_user) < amount:
             raise InsufficientFundsError("insufficient funds")
 
-        tx = Transaction(id=str(uuid4()), from_user=from_user, to_user=to_user, amount=int(amount), note=note)
+        tx = Transaction(id=self._next_id(), from_user=from_user, to_user=to_user, amount=amount, note=note,
+                         created_at_ns=time_ns())
         self._apply(tx)
         return tx
 
+    def bulk_apply(self, rows: Iterable[Tuple[Optional[str], str, int]]) -> List[Transaction]:
+        """Post many (from_user, to_user, amount) rows in one pass.
+
+        Bulk-load path for replaying trusted history (e.g. an import at
+        startup): rows are NOT validated or checked for sufficient
+        funds. Per-user deltas are aggregated first and each balance is
+        written back once, instead of mutating the dict per row.
+        """
+        deltas: Dict[str, int] = {}
+        posted: List[Transaction] = []
+        transfers: List[Transaction] = []
+        now = time_ns()
+        for from_user, to_user, amount in rows:
+            tx = Transaction(id=self._next_id(), from_user=from_user,
+                             to_user=to_user, amount=amount, created_at_ns=now)
+            posted.append(tx)
+            if from_user is not None:
+                deltas[from_user] = deltas.get(from_user, 0) - amount
+                transfers.append(tx)
+            deltas[to_user] = deltas.get(to_user, 0) + amount
+
+        balances = self._balances
+        for user, delta in deltas.items():
+            balances[user] += delta
+        self._transactions.extend(posted)
+        self._transfers.extend(transfers)
+        return posted
+
     def _apply(self, tx: Transaction) -> None:
         if tx.from_user is not None:
-            self._balances[tx.from_user] = self.balance(tx.from_user) - tx.amount
-        self._balances[tx.to_user] = self.balance(tx.to_user) + tx.amount
+            self._balances[tx.from_user] -= tx.amount
+            self._transfers.append(tx)
+        self._balances[tx.to_user] += tx.amount
         self._transactions.append(tx)
 
     @staticmethod
-    def _validate_user(user: str, *, field_name: str) -> None:
-        if not user or not isinstance(user, str):
+    def _validate_user(user: str, *, field_name: str) -> str:
+        # Exact type check: posting paths only ever see plain str, and
+        # `type(...) is str` skips the isinstance subclass walk.
+        if type(user) is not str or not user:
             raise LedgerError(f"{field_name} must be a non-empty string")
+        # Interning means repeated postings for the same account share one
+        # string object, so balance-dict lookups hit the pointer-equality
+        # fast path and transactions do not pin duplicate copies.
+        return sys.intern(user)
 
     @staticmethod
-    def _validate_amount(amount: int) -> None:
+    def _validate_amount(amount: int) -> int:
         try:
             numeric = int(amount)
         except (TypeError, ValueError) as exc:
@@ -109,3 +191,4 @@ class Ledger:
 
         if numeric <= 0:
             raise LedgerError("amount must be > 0")
+        return numeric